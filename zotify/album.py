@@ -1,7 +1,7 @@
 from zotify.const import ITEMS, ARTISTS, NAME, ID, DISC_NUMBER
 from zotify.termoutput import Printer
 from zotify.track import download_track
-from zotify.utils import fix_filename
+from zotify.utils import fix_filename, flush_archives
 from zotify.zotify import Zotify
 
 ALBUM_URL = 'https://api.spotify.com/v1/albums'
@@ -72,6 +72,8 @@ def download_album(album, wrapper_p_bars: list | None = None):
         p_bar.set_description(track[NAME])
         for bar in wrapper_p_bars:
             if type(bar) != int: bar.refresh()
+    
+    flush_archives()
 
 
 def download_artist_albums(artist, wrapper_p_bars: list | None = None):
@@ -4,13 +4,13 @@ from pathlib import Path
 
 from zotify.album import download_album, download_artist_albums
 from zotify.const import TRACK, NAME, ID, ARTIST, ARTISTS, ITEMS, TRACKS, EXPLICIT, ALBUM, ALBUMS, \
-    OWNER, PLAYLIST, PLAYLISTS, DISPLAY_NAME
+    OWNER, PLAYLIST, PLAYLISTS, DISPLAY_NAME, EPISODE, SHOW
 from zotify.loader import Loader
 from zotify.playlist import get_playlist_info, download_from_user_playlist, download_playlist
 from zotify.podcast import download_episode, download_show
 from zotify.termoutput import Printer, PrintChannel
 from zotify.track import download_track, get_saved_tracks, get_followed_artists
-from zotify.utils import splash, split_input, regex_input_for_urls
+from zotify.utils import splash, split_input, regex_input_for_urls, exit_on_termination
 from zotify.zotify import Zotify
 
 SEARCH_URL = 'https://api.spotify.com/v1/search'
@@ -18,6 +18,7 @@ SEARCH_URL = 'https://api.spotify.com/v1/search'
 
 def client(args) -> None:
     """ Connects to download server to perform query's and get songs to download """
+    exit_on_termination()
     Zotify(args)
     
     Printer.print(PrintChannel.SPLASH, splash())
@@ -111,28 +112,28 @@ def download_from_urls(urls: list[str]) -> bool:
     p_bar = Printer.progress(urls, unit='urls', total=len(urls), unit_scale=True, disable=not Zotify.CONFIG.get_show_url_pbar(), pos=pos)
     wrapper_p_bars = [p_bar if Zotify.CONFIG.get_show_url_pbar() else pos]
     for spotify_url in p_bar:
-        track_id, album_id, playlist_id, episode_id, show_id, artist_id = regex_input_for_urls(spotify_url)
+        ref = regex_input_for_urls(spotify_url)
         
-        if track_id is not None:
+        if ref.kind == TRACK:
             download = True
-            download_track('single', track_id, wrapper_p_bars=wrapper_p_bars)
-        elif artist_id is not None:
+            download_track('single', ref.id, wrapper_p_bars=wrapper_p_bars)
+        elif ref.kind == ARTIST:
             download = True
-            download_artist_albums(artist_id, wrapper_p_bars)
-        elif album_id is not None:
+            download_artist_albums(ref.id, wrapper_p_bars)
+        elif ref.kind == ALBUM:
             download = True
-            download_album(album_id, wrapper_p_bars)
-        elif playlist_id is not None:
+            download_album(ref.id, wrapper_p_bars)
+        elif ref.kind == PLAYLIST:
             download = True
-            download_playlist({ID: playlist_id,
-                               NAME: get_playlist_info(playlist_id)[0]},
+            download_playlist({ID: ref.id,
+                               NAME: get_playlist_info(ref.id)[0]},
                                wrapper_p_bars)
-        elif episode_id is not None:
+        elif ref.kind == EPISODE:
             download = True
-            download_episode(episode_id, wrapper_p_bars)
-        elif show_id is not None:
+            download_episode(ref.id, wrapper_p_bars)
+        elif ref.kind == SHOW:
             download = True
-            download_show(show_id, wrapper_p_bars)
+            download_show(ref.id, wrapper_p_bars)
         for bar in wrapper_p_bars:
             if type(bar) != int: bar.refresh()
     
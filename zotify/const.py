@@ -68,6 +68,8 @@ DISC_NUMBER = 'disc_number'
 
 SHOW = 'show'
 
+EPISODE = 'episode'
+
 ERROR = 'error'
 
 EXPLICIT = 'explicit'
@@ -2,7 +2,7 @@ from zotify.const import ITEMS, ID, TRACK, NAME, TYPE
 from zotify.podcast import download_episode
 from zotify.termoutput import Printer, PrintChannel
 from zotify.track import download_track
-from zotify.utils import split_input
+from zotify.utils import split_input, flush_archives
 from zotify.zotify import Zotify
 
 MY_PLAYLISTS_URL = 'https://api.spotify.com/v1/me/playlists'
@@ -75,6 +75,8 @@ def download_playlist(playlist, wrapper_p_bars: list | None = None):
         p_bar.set_description(song[NAME])
         for bar in wrapper_p_bars:
             if type(bar) != int: bar.refresh()
+    
+    flush_archives()
 
 
 def download_from_user_playlist():
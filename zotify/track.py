@@ -12,8 +12,8 @@ from zotify.const import TRACKS, ALBUM, GENRES, NAME, ITEMS, DISC_NUMBER, TRACK_
     RELEASE_DATE, ID, TRACKS_URL, FOLLOWED_ARTISTS_URL, SAVED_TRACKS_URL, TRACK_STATS_URL, CODEC_MAP, EXT_MAP, DURATION_MS, \
     HREF, ARTISTS, WIDTH
 from zotify.termoutput import Printer, PrintChannel
-from zotify.utils import fix_filename, set_audio_tags, set_music_thumbnail, create_download_directory, add_to_m3u,\
-    get_directory_song_ids, add_to_directory_song_ids, get_previously_downloaded, add_to_archive, fmt_seconds
+from zotify.utils import fix_filename, set_audio_tags, get_music_thumbnail, create_download_directory, add_to_m3u,\
+    is_directory_song_id, add_to_directory_song_ids, is_previously_downloaded, add_to_archive, fmt_seconds
 from zotify.zotify import Zotify
 import traceback
 from zotify.loader import Loader
@@ -189,8 +189,8 @@ def download_track(mode: str, track_id: str, extra_keys=None, wrapper_p_bars: li
             filename_temp = PurePath(Zotify.CONFIG.get_temp_download_dir()).joinpath(f'zotify_{str(uuid.uuid4())}_{track_id}.{ext}')
             
         check_name = Path(filename).is_file() and Path(filename).stat().st_size
-        check_local = scraped_song_id in get_directory_song_ids(filedir)
-        check_all_time = scraped_song_id in get_previously_downloaded()
+        check_local = is_directory_song_id(filedir, scraped_song_id)
+        check_all_time = is_previously_downloaded(scraped_song_id)
         if Zotify.CONFIG.get_disable_directory_archives():
             check_local = not Zotify.CONFIG.get_skip_existing() or not Zotify.CONFIG.get_skip_previously_downloaded()
             # avoids overwrite case only when both "safety switches" are on
@@ -285,10 +285,17 @@ def download_track(mode: str, track_id: str, extra_keys=None, wrapper_p_bars: li
                     # no metadata is written to track prior to conversion
                     convert_audio_format(filename_temp)
                     
+                    try:
+                        artwork = get_music_thumbnail(image_url)
+                    except Exception:
+                        artwork = None
+                        Printer.print(PrintChannel.WARNINGS, "\n")
+                        Printer.print(PrintChannel.WARNINGS, f'###   UNABLE TO DOWNLOAD COVER ART FOR "{song_name}"   ###')
+                        Printer.print(PrintChannel.WARNINGS, "\n")
+                    
                     try:
                         set_audio_tags(filename_temp, artists, genres, name, album_name, album_artist, release_year, 
-                                       disc_number, track_number, total_tracks, total_discs)
-                        set_music_thumbnail(filename_temp, image_url)
+                                       disc_number, track_number, total_tracks, total_discs, artwork)
                     except Exception:
                         Printer.print(PrintChannel.ERRORS, "\n")
                         Printer.print(PrintChannel.ERRORS, "Unable to write metadata, ensure FFMPEG is installed and added to your PATH.")
@@ -1,122 +1,309 @@
+import atexit
 import datetime
-import math
 import os
 import platform
 import re
+import signal
+import stat
 import subprocess
+import sys
+import threading
+import time
 from enum import Enum
 from pathlib import Path, PurePath
-from typing import List, Tuple
-
-import music_tag
-import requests
+from types import SimpleNamespace
+from typing import List, NamedTuple, Optional, Set, Tuple
 
 from zotify.const import ARTIST, GENRE, TRACKTITLE, ALBUM, YEAR, DISCNUMBER, TRACKNUMBER, ARTWORK, \
-    WINDOWS_SYSTEM, ALBUMARTIST, TOTALTRACKS, TOTALDISCS, EXT_MAP
+    WINDOWS_SYSTEM, ALBUMARTIST, TOTALTRACKS, TOTALDISCS, EXT_MAP, TRACK, PLAYLIST, EPISODE, SHOW
+from zotify.termoutput import Printer, PrintChannel
 from zotify.zotify import Zotify
 
 
+SPOTIFY_INPUT_REGEX = re.compile(
+    r'^(?:spotify:(?P<UriKind>track|album|playlist|episode|show|artist):(?P<UriID>[0-9a-zA-Z]{22})'
+    r'|(?:https?://)?open\.spotify\.com(?:/intl-\w+)?/(?P<UrlKind>track|album|playlist|episode|show|artist)/'
+    r'(?P<UrlID>[0-9a-zA-Z]{22})(?:\?si=.+?)?)$'
+)
+
+INVALID_FILENAME_REGEX = re.compile(
+    r'[/\\:|<>"?*\0-\x1f]|^(AUX|COM[1-9]|CON|LPT[1-9]|NUL|PRN)(?![^.])|^\s|[\s.]$', re.IGNORECASE)
+
+
+class _AppendBuffer:
+    """ Collects lines appended to archive files and writes them out in batches """
+    def __init__(self, max_pending=32, max_age=30):
+        self.max_pending = max_pending
+        self.max_age = max_age
+        self._pending = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def append(self, path, line: str) -> None:
+        """ Queues a line, writing out pending lines once enough have piled up or they got too old """
+        path = str(path)
+        with self._lock:
+            lines = self._pending.setdefault(path, [])
+            lines.append(line)
+            full = len(lines) >= self.max_pending
+            stale = time.monotonic() - self._last_flush >= self.max_age
+        if stale:
+            self.flush_all()
+        elif full:
+            self.flush(path)
+
+    def pending(self, path) -> List[str]:
+        """ Returns lines for a file which have not been written out yet """
+        with self._lock:
+            return list(self._pending.get(str(path), []))
+
+    def has_failed(self, path) -> bool:
+        """ Returns whether the last write to a file failed """
+        with self._lock:
+            return str(path) in self._failed
+
+    def flush(self, path) -> bool:
+        """ Writes out pending lines for a single file, keeping them queued if the write fails """
+        path = str(path)
+        with self._lock:
+            lines = self._pending.pop(path, None)
+        if not lines:
+            return True
+        try:
+            self._write(path, lines)
+        except OSError as e:
+            with self._lock:
+                self._pending[path] = lines + self._pending.get(path, [])
+                self._failed.add(path)
+            forget_archive_lines(path, lines)
+            Printer.print(PrintChannel.ERRORS, f'###   ERROR: UNABLE TO WRITE TO "{path}" ({e.strerror}), WILL RETRY   ###')
+            return False
+        with self._lock:
+            self._failed.discard(path)
+        return True
+
+    def flush_all(self) -> None:
+        """ Writes out pending lines for every file, carrying on past files that fail """
+        with self._lock:
+            paths = list(self._pending)
+            self._last_flush = time.monotonic()
+        for path in paths:
+            self.flush(path)
+
+    @staticmethod
+    def _write(path: str, lines: List[str]) -> None:
+        # raw fd writes skip the TextIOWrapper/BufferedWriter layers of open()
+        payload = ''.join(lines).replace('\n', os.linesep).encode('utf-8')
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+
+APPEND_BUFFER = _AppendBuffer()
+atexit.register(APPEND_BUFFER.flush_all)
+
+
+def flush_archives() -> None:
+    """ Writes out every pending archive, .song_ids and m3u line """
+    APPEND_BUFFER.flush_all()
+
+
+def exit_on_termination() -> None:
+    """ Turns SIGTERM/SIGHUP into a normal exit so pending archive lines are flushed by atexit """
+    def handle_signal(signum, frame):
+        raise SystemExit(128 + signum)
+
+    for name in ('SIGTERM', 'SIGHUP'):
+        signum = getattr(signal, name, None)
+        # SIGHUP does not exist on Windows, and handlers set up by others are left alone
+        if signum is not None and signal.getsignal(signum) == signal.SIG_DFL:
+            signal.signal(signum, handle_signal)
+
+IS_WINDOWS = platform.system() == WINDOWS_SYSTEM
+VT_ENABLED = False
+
+# reuses connections to the artwork server between tracks, created on first use
+HTTP_SESSION = None
+
+# archive path -> (mtime when read, song ids)
+ARCHIVE_CACHE = {}
+
+M3U_PATH = None
+
+# .song_ids file of the directory songs were last added to, flushed when moving on to another one
+LAST_SONG_IDS_PATH = None
+
+# directories already set up by create_download_directory during this run
+INITIALIZED_DIRS = set()
+
+# (Config.Values the snapshot was taken from, snapshot)
+CONFIG_SNAPSHOT = (None, None)
+
+
+def config_snapshot() -> SimpleNamespace:
+    """ Returns config values used for every track, rebuilt only when the config is reloaded """
+    global CONFIG_SNAPSHOT
+    values, snapshot = CONFIG_SNAPSHOT
+    if values is not Zotify.CONFIG.Values:
+        snapshot = SimpleNamespace(
+            all_genres=Zotify.CONFIG.get_all_genres(),
+            genres_delimiter=Zotify.CONFIG.get_all_genres_delimiter(),
+            disc_track_totals=Zotify.CONFIG.get_disc_track_totals(),
+            ext=EXT_MAP.get(Zotify.CONFIG.get_download_format().lower()),
+            disable_directory_archives=Zotify.CONFIG.get_disable_directory_archives(),
+            song_archive=Zotify.CONFIG.get_song_archive(),
+        )
+        CONFIG_SNAPSHOT = (Zotify.CONFIG.Values, snapshot)
+    return snapshot
+
+
 def create_download_directory(download_path: str) -> None:
     """ Create directory and add a hidden file with song ids """
-    Path(download_path).mkdir(parents=True, exist_ok=True)
+    if str(download_path) in INITIALIZED_DIRS:
+        return
+    download_dir = Path(download_path)
+    download_dir.mkdir(parents=True, exist_ok=True)
 
     # add hidden file with song ids
-    hidden_file_path = PurePath(download_path).joinpath('.song_ids')
-    if Zotify.CONFIG.get_disable_directory_archives():
-        return
-    if not Path(hidden_file_path).is_file():
+    hidden_file_path = download_dir / '.song_ids'
+    if not config_snapshot().disable_directory_archives and not hidden_file_path.is_file():
         with open(hidden_file_path, 'w', encoding='utf-8') as f:
             pass
+    INITIALIZED_DIRS.add(str(download_path))
+
+
+def archive_timestamp() -> str:
+    """ Returns the current time formatted for archive entries (%Y-%m-%d %H:%M:%S) """
+    now = datetime.datetime.now()
+    return f'{now.year:04d}-{now.month:02d}-{now.day:02d} {now.hour:02d}:{now.minute:02d}:{now.second:02d}'
+
+
+def load_archive_ids(archive_path) -> Set[str]:
+    """ Returns the cached set of song ids in an archive file (do not modify), re-read only when it changed on disk """
+    archive_path = str(archive_path)
+    try:
+        st = os.stat(archive_path)
+        # anything that is not a regular file is treated like a missing archive
+        mtime = st.st_mtime_ns if stat.S_ISREG(st.st_mode) else None
+    except OSError:
+        mtime = None
+
+    cached = ARCHIVE_CACHE.get(archive_path)
+    if cached is None or cached[0] != mtime:
+        ids = set()
+        if mtime is not None:
+            with open(archive_path, 'r', encoding='utf-8', buffering=1 << 16) as f:
+                # rstrip only matters for legacy lines holding nothing but an id
+                ids.update(line.partition('\t')[0].rstrip() for line in f)
+        if not APPEND_BUFFER.has_failed(archive_path):
+            ids.update(line.partition('\t')[0] for line in APPEND_BUFFER.pending(archive_path))
+        cached = (mtime, ids)
+        ARCHIVE_CACHE[archive_path] = cached
+
+    return cached[1]
 
 
-def get_previously_downloaded() -> List[str]:
-    """ Returns list of all time downloaded songs """
+def add_archive_id(archive_path, song_id: str, line: str) -> None:
+    """ Queues an archive line and records its song id in the cached set unless writes to the file are failing """
+    cached = ARCHIVE_CACHE.get(str(archive_path))
+    if cached is not None and not APPEND_BUFFER.has_failed(archive_path):
+        cached[1].add(song_id)
+    APPEND_BUFFER.append(archive_path, line)
 
-    ids = []
-    archive_path = Zotify.CONFIG.get_song_archive()
 
-    if Path(archive_path).exists():
-        with open(archive_path, 'r', encoding='utf-8') as f:
-            ids = [line.strip().split('\t')[0] for line in f.readlines()]
+def forget_archive_lines(archive_path, lines: List[str]) -> None:
+    """ Invalidates the cached ids of a file whose lines could not be written, so the next lookup re-reads the disk """
+    ARCHIVE_CACHE.pop(str(archive_path), None)
 
-    return ids
+
+def get_previously_downloaded() -> Set[str]:
+    """ Returns set of all time downloaded songs """
+    return set(load_archive_ids(config_snapshot().song_archive))
+
+
+def is_previously_downloaded(song_id: str) -> bool:
+    """ Returns whether a song is in the all time downloaded songs archive """
+    return song_id in load_archive_ids(config_snapshot().song_archive)
 
 
 def add_to_archive(song_id: str, filename: str, author_name: str, song_name: str) -> None:
     """ Adds song id to all time installed songs archive """
     
-    archive_path = Zotify.CONFIG.get_song_archive()
-    
-    if Path(archive_path).exists():
-        with open(archive_path, 'a', encoding='utf-8') as file:
-            file.write(f'{song_id}\t{datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\t{author_name}\t{song_name}\t{filename}\n')
-    else:
-        with open(archive_path, 'w', encoding='utf-8') as file:
-            file.write(f'{song_id}\t{datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\t{author_name}\t{song_name}\t{filename}\n')
+    archive_path = config_snapshot().song_archive
+    add_archive_id(archive_path, song_id, f'{song_id}\t{archive_timestamp()}\t{author_name}\t{song_name}\t{filename}\n')
 
 
 def add_to_m3u(filename: PurePath, song_duration: float, song_name: str) -> None:
     """ Adds song to a .m3u8 playlist"""
     
-    m3u_path = Zotify.CONFIG.get_root_path() / (Zotify.datetime_launch + "_zotify.m3u8")
-    if not Path(m3u_path).exists():
-        with open(m3u_path, 'w', encoding='utf-8') as file:
-            file.write("#EXTM3U\n\n")
+    global M3U_PATH
+    if M3U_PATH is None:
+        # the playlist name is fixed for the whole run, so the header check only happens once
+        M3U_PATH = Path(Zotify.CONFIG.get_root_path(), Zotify.datetime_launch + "_zotify.m3u8")
+        if not M3U_PATH.is_file() or M3U_PATH.stat().st_size == 0:
+            APPEND_BUFFER.append(M3U_PATH, "#EXTM3U\n\n")
     
-    with open(m3u_path, 'a', encoding='utf-8') as file:
-        file.write(f"#EXTINF:{int(song_duration)}, {song_name}\n")
-        file.write(f"{filename}\n\n")
+    APPEND_BUFFER.append(M3U_PATH, f"#EXTINF:{int(song_duration)}, {song_name}\n{filename}\n\n")
 
 
-def get_directory_song_ids(download_path: str) -> List[str]:
+def get_directory_song_ids(download_path: str) -> Set[str]:
     """ Gets song ids of songs in directory """
     
-    song_ids = []
-    
-    hidden_file_path = PurePath(download_path).joinpath('.song_ids')
-    
-    if Path(hidden_file_path).is_file() and not Zotify.CONFIG.get_disable_directory_archives():
-        with open(hidden_file_path, 'r', encoding='utf-8') as file:
-            song_ids.extend([line.strip().split('\t')[0] for line in file.readlines()])
-    
-    return song_ids
+    if config_snapshot().disable_directory_archives:
+        return set()
+    return set(load_archive_ids(Path(download_path) / '.song_ids'))
+
+
+def is_directory_song_id(download_path: str, song_id: str) -> bool:
+    """ Returns whether a song is in the directory's .song_ids file """
+    if config_snapshot().disable_directory_archives:
+        return False
+    return song_id in load_archive_ids(Path(download_path) / '.song_ids')
 
 
 def add_to_directory_song_ids(download_path: str, song_id: str, filename: str, author_name: str, song_name: str) -> None:
     """ Appends song_id to .song_ids file in directory """
     
-    hidden_file_path = PurePath(download_path).joinpath('.song_ids')
-    if Zotify.CONFIG.get_disable_directory_archives():
+    global LAST_SONG_IDS_PATH
+    if config_snapshot().disable_directory_archives:
         return
-    # not checking if file exists because we need an exception
-    # to be raised if something is wrong
-    with open(hidden_file_path, 'a', encoding='utf-8') as file:
-        file.write(f'{song_id}\t{datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\t{author_name}\t{song_name}\t{filename}\n')
+    hidden_file_path = Path(download_path) / '.song_ids'
+    if LAST_SONG_IDS_PATH is not None and LAST_SONG_IDS_PATH != hidden_file_path:
+        APPEND_BUFFER.flush(LAST_SONG_IDS_PATH)
+    LAST_SONG_IDS_PATH = hidden_file_path
+    # the file is created by create_download_directory, failed writes are reported when the buffer is flushed
+    add_archive_id(hidden_file_path, song_id, f'{song_id}\t{archive_timestamp()}\t{author_name}\t{song_name}\t{filename}\n')
 
 
 def get_downloaded_song_duration(filename: str) -> float:
     """ Returns the downloaded file's duration in seconds """
     
-    command = ['ffprobe', '-show_entries', 'format=duration', '-i', f'{filename}']
+    # only print the bare duration value so no parsing of the output is needed
+    command = ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'default=nw=1:nk=1', '-i', f'{filename}']
     output = subprocess.run(command, capture_output=True)
     
-    duration = re.search(r'[\D]=([\d\.]*)', str(output.stdout)).groups()[0]
-    duration = float(duration)
+    duration = float(output.stdout)
     
     return duration
 
 
 def split_input(selection) -> List[str]:
-    """ Returns a list of inputted strings """
-    inputs = []
+    """
+    Returns a list of inputted strings
+    >>> split_input("2-4")
+    ['2', '3', '4']
+    >>> split_input("1, 5,7")
+    ['1', '5', '7']
+    """
     if '-' in selection:
-        for number in range(int(selection.split('-')[0]), int(selection.split('-')[1]) + 1):
-            inputs.append(number)
-    else:
-        selections = selection.split(',')
-        for i in selections:
-            inputs.append(i.strip())
-    return inputs
+        start, _, end = selection.partition('-')
+        return [str(number) for number in range(int(start), int(end) + 1)]
+    return [i.strip() for i in selection.split(',')]
 
 
 def splash() -> str:
@@ -133,36 +320,45 @@ def splash() -> str:
 
 def clear() -> None:
     """ Clear the console window """
-    if platform.system() == WINDOWS_SYSTEM:
-        os.system('cls')
-    else:
-        os.system('clear')
-
-
-def set_audio_tags(filename, artists, genres, name, album_name, album_artist, release_year, disc_number, track_number, total_tracks, total_discs) -> None:
-    """ sets music_tag metadata """
+    global VT_ENABLED
+    if not VT_ENABLED:
+        if IS_WINDOWS:
+            # an empty command switches conhost into VT mode so escape sequences are honored
+            os.system('')
+        VT_ENABLED = True
+    sys.stdout.write('\x1b[2J\x1b[H')
+    sys.stdout.flush()
+
+
+def set_audio_tags(filename, artists, genres, name, album_name, album_artist, release_year, disc_number, track_number, total_tracks, total_discs, artwork=None) -> None:
+    """ sets music_tag metadata and, if given, the cover artwork """
+    # imported here so commands that never tag files do not pay for loading it
+    import music_tag
+    cfg = config_snapshot()
     tags = music_tag.load_file(filename)
     tags[ALBUMARTIST] = album_artist
     tags[ARTIST] = conv_artist_format(artists)
-    tags[GENRE] = genres[0] if not Zotify.CONFIG.get_all_genres() else Zotify.CONFIG.get_all_genres_delimiter().join(genres)
+    tags[GENRE] = genres[0] if not cfg.all_genres else cfg.genres_delimiter.join(genres)
     tags[TRACKTITLE] = name
     tags[ALBUM] = album_name
     tags[YEAR] = release_year
     tags[DISCNUMBER] = disc_number
     tags[TRACKNUMBER] = track_number
     
-    if Zotify.CONFIG.get_disc_track_totals():
+    if cfg.disc_track_totals:
         tags[TOTALTRACKS] = total_tracks
         if total_discs is not None:
             tags[TOTALDISCS] = total_discs
     
-    ext = EXT_MAP[Zotify.CONFIG.get_download_format().lower()]
-    if ext == "mp3" and not Zotify.CONFIG.get_disc_track_totals():
+    if cfg.ext == "mp3" and not cfg.disc_track_totals:
         # music_tag python library writes DISCNUMBER and TRACKNUMBER as X/Y instead of X for mp3
         # this method bypasses all internal formatting, probably not resilient against arbitrary inputs
         tags.set_raw("mp3", "TPOS", str(disc_number))
         tags.set_raw("mp3", "TRCK", str(track_number))
     
+    if artwork is not None:
+        tags[ARTWORK] = artwork
+    
     tags.save()
 
 
@@ -171,101 +367,39 @@ def conv_artist_format(artists) -> str:
     return ', '.join(artists)
 
 
-def set_music_thumbnail(filename, image_url) -> None:
-    """ Downloads cover artwork """
-    img = requests.get(image_url).content
-    tags = music_tag.load_file(filename)
-    tags[ARTWORK] = img
-    tags.save()
+def get_http_session():
+    """ Returns the shared requests session used for artwork downloads """
+    global HTTP_SESSION
+    if HTTP_SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        HTTP_SESSION = requests.Session()
+        HTTP_SESSION.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=3))
+    return HTTP_SESSION
 
 
-def regex_input_for_urls(search_input) -> Tuple[str, str, str, str, str, str]:
-    """ Since many kinds of search may be passed at the command line, process them all here. """
-    track_uri_search = re.search(
-        r'^spotify:track:(?P<TrackID>[0-9a-zA-Z]{22})$', search_input)
-    track_url_search = re.search(
-        r'^(https?://)?open\.spotify\.com(?:/intl-\w+)?/track/(?P<TrackID>[0-9a-zA-Z]{22})(\?si=.+?)?$',
-        search_input,
-    )
-
-    album_uri_search = re.search(
-        r'^spotify:album:(?P<AlbumID>[0-9a-zA-Z]{22})$', search_input)
-    album_url_search = re.search(
-        r'^(https?://)?open\.spotify\.com(?:/intl-\w+)?/album/(?P<AlbumID>[0-9a-zA-Z]{22})(\?si=.+?)?$',
-        search_input,
-    )
-
-    playlist_uri_search = re.search(
-        r'^spotify:playlist:(?P<PlaylistID>[0-9a-zA-Z]{22})$', search_input)
-    playlist_url_search = re.search(
-        r'^(https?://)?open\.spotify\.com(?:/intl-\w+)?/playlist/(?P<PlaylistID>[0-9a-zA-Z]{22})(\?si=.+?)?$',
-        search_input,
-    )
-
-    episode_uri_search = re.search(
-        r'^spotify:episode:(?P<EpisodeID>[0-9a-zA-Z]{22})$', search_input)
-    episode_url_search = re.search(
-        r'^(https?://)?open\.spotify\.com(?:/intl-\w+)?/episode/(?P<EpisodeID>[0-9a-zA-Z]{22})(\?si=.+?)?$',
-        search_input,
-    )
-
-    show_uri_search = re.search(
-        r'^spotify:show:(?P<ShowID>[0-9a-zA-Z]{22})$', search_input)
-    show_url_search = re.search(
-        r'^(https?://)?open\.spotify\.com(?:/intl-\w+)?/show/(?P<ShowID>[0-9a-zA-Z]{22})(\?si=.+?)?$',
-        search_input,
-    )
-
-    artist_uri_search = re.search(
-        r'^spotify:artist:(?P<ArtistID>[0-9a-zA-Z]{22})$', search_input)
-    artist_url_search = re.search(
-        r'^(https?://)?open\.spotify\.com(?:/intl-\w+)?/artist/(?P<ArtistID>[0-9a-zA-Z]{22})(\?si=.+?)?$',
-        search_input,
-    )
-
-    if track_uri_search is not None or track_url_search is not None:
-        track_id_str = (track_uri_search
-                        if track_uri_search is not None else
-                        track_url_search).group('TrackID')
-    else:
-        track_id_str = None
+def get_music_thumbnail(image_url) -> bytes:
+    """ Downloads cover artwork """
+    return get_http_session().get(image_url, timeout=30).content
 
-    if album_uri_search is not None or album_url_search is not None:
-        album_id_str = (album_uri_search
-                        if album_uri_search is not None else
-                        album_url_search).group('AlbumID')
-    else:
-        album_id_str = None
 
-    if playlist_uri_search is not None or playlist_url_search is not None:
-        playlist_id_str = (playlist_uri_search
-                           if playlist_uri_search is not None else
-                           playlist_url_search).group('PlaylistID')
-    else:
-        playlist_id_str = None
+class ParsedSpotifyRef(NamedTuple):
+    kind: Optional[str]
+    id: Optional[str]
 
-    if episode_uri_search is not None or episode_url_search is not None:
-        episode_id_str = (episode_uri_search
-                          if episode_uri_search is not None else
-                          episode_url_search).group('EpisodeID')
-    else:
-        episode_id_str = None
 
-    if show_uri_search is not None or show_url_search is not None:
-        show_id_str = (show_uri_search
-                       if show_uri_search is not None else
-                       show_url_search).group('ShowID')
-    else:
-        show_id_str = None
+def regex_input_for_urls(search_input) -> ParsedSpotifyRef:
+    """ Since many kinds of search may be passed at the command line, process them all here. """
+    match = SPOTIFY_INPUT_REGEX.match(search_input)
+    if match is None:
+        return ParsedSpotifyRef(None, None)
+    return ParsedSpotifyRef(match.group('UriKind') or match.group('UrlKind'), match.group('UriID') or match.group('UrlID'))
 
-    if artist_uri_search is not None or artist_url_search is not None:
-        artist_id_str = (artist_uri_search
-                         if artist_uri_search is not None else
-                         artist_url_search).group('ArtistID')
-    else:
-        artist_id_str = None
 
-    return track_id_str, album_id_str, playlist_id_str, episode_id_str, show_id_str, artist_id_str
+def regex_input_for_urls_legacy(search_input) -> Tuple[str, str, str, str, str, str]:
+    """ Returns the parsed input as (track, album, playlist, episode, show, artist) ids """
+    ref = regex_input_for_urls(search_input)
+    return tuple(ref.id if ref.kind == kind else None for kind in (TRACK, ALBUM, PLAYLIST, EPISODE, SHOW, ARTIST))
 
 
 def fix_filename(name):
@@ -284,27 +418,16 @@ def fix_filename(name):
     >>> all('_' == fix_filename(chr(i)) for i in list(range(32)))
     True
     """
-    return re.sub(r'[/\\:|<>"?*\0-\x1f]|^(AUX|COM[1-9]|CON|LPT[1-9]|NUL|PRN)(?![^.])|^\s|[\s.]$', "_", str(name), flags=re.IGNORECASE)
+    return INVALID_FILENAME_REGEX.sub("_", str(name))
 
 
 def fmt_seconds(secs: float) -> str:
-    val = math.floor(secs)
-
-    s = math.floor(val % 60)
-    val -= s
-    val /= 60
-
-    m = math.floor(val % 60)
-    val -= m
-    val /= 60
-
-    h = math.floor(val)
+    m, s = divmod(int(secs), 60)
+    h, m = divmod(m, 60)
 
-    if h == 0 and m == 0 and s == 0:
-        return "0s"
-    elif h == 0 and m == 0:
-        return f'{s}s'.zfill(2)
-    elif h == 0:
-        return f'{m}'.zfill(2) + ':' + f'{s}'.zfill(2)
+    if h:
+        return f'{h:02d}:{m:02d}:{s:02d}'
+    elif m:
+        return f'{m:02d}:{s:02d}'
     else:
-        return f'{h}'.zfill(2) + ':' + f'{m}'.zfill(2) + ':' + f'{s}'.zfill(2)
+        return f'{s}s'